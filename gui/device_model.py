@@ -0,0 +1,236 @@
+"""
+Device model for the VM Device GUI.
+Keeps device listings keyed by vendor:product so the tables and tray menu can be
+updated incrementally, searched, sorted and grouped without rebuilding every row.
+"""
+import threading
+
+SORT_FIELDS = ("vendor", "product", "name", "status")
+GROUP_FIELDS = ("vendor", "status")
+
+# Minimum query length served by the trigram index; shorter queries scan the cached text
+_NGRAM = 3
+
+
+def _trigrams(text):
+    return {text[i:i + _NGRAM] for i in range(len(text) - _NGRAM + 1)}
+
+
+class DeviceModel:
+    def __init__(self, sort_field="name", group_field=None):
+        self.sort_field = sort_field
+        self.sort_reverse = False
+        self.group_field = group_field
+        self._devices = {}      # key -> device dict
+        self._order = []        # keys in display order
+        self._text = {}         # key -> lowercase searchable text
+        self._index = {}        # trigram -> set of keys
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _keys_for(devices):
+        """Assign stable keys; identical vendor:product pairs get an occurrence suffix."""
+        seen = {}
+        for dev in devices:
+            base = f"{dev['vendor']}:{dev['product']}"
+            count = seen.get(base, 0)
+            seen[base] = count + 1
+            yield (base if count == 0 else f"{base}#{count}"), dev
+
+    def update(self, devices):
+        """
+        Replace the model contents with a new listing.
+        Returns (added, removed, changed) key lists so views only touch rows that differ.
+        """
+        with self._lock:
+            incoming = dict(self._keys_for(devices))
+            removed = [key for key in self._devices if key not in incoming]
+            added = []
+            changed = []
+            for key, dev in incoming.items():
+                old = self._devices.get(key)
+                if old is None:
+                    added.append(key)
+                elif old != dev:
+                    changed.append(key)
+
+            for key in removed:
+                self._unindex(key)
+                del self._devices[key]
+            for key in added + changed:
+                if key in self._devices:
+                    self._unindex(key)
+                self._devices[key] = dict(incoming[key])
+                self._reindex(key)
+
+            if added or removed or changed:
+                self._resort()
+            return added, removed, changed
+
+    def _reindex(self, key):
+        dev = self._devices[key]
+        text = f"{dev['vendor']}:{dev['product']} {dev['name']} {dev.get('status', '')}".lower()
+        self._text[key] = text
+        for gram in _trigrams(text):
+            self._index.setdefault(gram, set()).add(key)
+
+    def _unindex(self, key):
+        for gram in _trigrams(self._text.pop(key, "")):
+            keys = self._index.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._index[gram]
+
+    def _resort(self):
+        field = self.sort_field
+        self._order = sorted(
+            self._devices,
+            key=lambda k: (str(self._devices[k].get(field, "")).lower(), k),
+            reverse=self.sort_reverse
+        )
+
+    def set_sort(self, field, reverse=False):
+        with self._lock:
+            self.sort_field = field
+            self.sort_reverse = reverse
+            self._resort()
+
+    def set_group(self, field):
+        self.group_field = field or None
+
+    def search(self, query):
+        """Return the set of keys whose ID, name or status contains the query (case-insensitive)."""
+        query = query.strip().lower()
+        with self._lock:
+            if not query:
+                return set(self._devices)
+            if len(query) < _NGRAM:
+                return {key for key, text in self._text.items() if query in text}
+            candidates = None
+            for gram in _trigrams(query):
+                keys = self._index.get(gram, set())
+                candidates = set(keys) if candidates is None else candidates & keys
+                if not candidates:
+                    return set()
+            # Trigrams can match out of order, so confirm the substring itself
+            return {key for key in candidates if query in self._text[key]}
+
+    def view(self, query=""):
+        """Return keys in display order, filtered by an optional search query."""
+        matches = self.search(query) if query.strip() else None
+        with self._lock:
+            if matches is None:
+                return list(self._order)
+            return [key for key in self._order if key in matches]
+
+    def grouped_view(self, query=""):
+        """Return [(group, keys)] in display order, or a single (None, keys) group when ungrouped."""
+        keys = self.view(query)
+        if not self.group_field:
+            return [(None, keys)]
+        groups = {}
+        with self._lock:
+            for key in keys:
+                groups.setdefault(str(self._devices[key].get(self.group_field, "")), []).append(key)
+        return sorted(groups.items())
+
+    def get(self, key):
+        with self._lock:
+            dev = self._devices.get(key)
+            return dict(dev) if dev is not None else None
+
+    def devices(self, limit=None):
+        """Return device dicts in display order, optionally capped to the first `limit`."""
+        with self._lock:
+            keys = self._order if limit is None else self._order[:limit]
+            return [dict(self._devices[key]) for key in keys]
+
+    def __len__(self):
+        return len(self._devices)
+
+
+if __name__ == "__main__":
+    # Benchmark: python device_model.py [DEVICE_COUNT]
+    # Times the model, then the Treeview sync in a hidden window (skipped without a display)
+    import random
+    import sys
+    import time
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    vendors = ["046d", "1d6b", "0bda", "8087", "18a5", "05e3", "1532", "0951"]
+    statuses = ["Actively Attached", "Available", "Live Only", "Disconnected"]
+
+    def make_devices(n, seed):
+        rng = random.Random(seed)
+        return [
+            {
+                "vendor": vendors[i % len(vendors)],
+                "product": f"{i:04x}",
+                "name": f"Device {i} {rng.choice(['Receiver', 'Headset', 'Webcam', 'Flash Drive', 'Hub'])}",
+                "status": rng.choice(statuses),
+            }
+            for i in range(n)
+        ]
+
+    def timed(label, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        print(f"{label:<40} {(time.perf_counter() - start) * 1000:8.2f} ms")
+        return result
+
+    model = DeviceModel()
+    initial = make_devices(count, seed=1)
+    timed(f"initial load ({count} devices)", model.update, initial)
+
+    refreshed = [dict(dev) for dev in initial]
+    for dev in random.Random(2).sample(refreshed, max(1, count // 100)):
+        dev["status"] = "Disconnected"
+    added, removed, changed = timed("refresh with 1% changed", model.update, refreshed)
+    print(f"{'':<40} {len(changed)} changed, {len(added)} added, {len(removed)} removed")
+    timed("refresh with nothing changed", model.update, refreshed)
+
+    timed("search 'headset'", model.search, "headset")
+    timed("search '04' (short query)", model.search, "04")
+    timed("sort by vendor", model.set_sort, "vendor")
+    model.set_group("vendor")
+    timed("grouped view by vendor", model.grouped_view, "")
+
+    # View layer: drive the GUI's Treeview sync against a hidden window
+    import tkinter as tk
+    from tkinter import ttk
+    from vm_device_gui import VMDeviceGUI
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Treeview benchmark skipped (needs a display): {e}")
+        sys.exit(0)
+    root.withdraw()
+    tree = ttk.Treeview(root, columns=("vendor", "product", "name", "status"), show="headings")
+    sync = VMDeviceGUI._sync_device_table
+    view_model = DeviceModel()
+    print()
+
+    def sync_update(devices):
+        added, removed, changed = view_model.update(devices)
+        sync(tree, view_model, "", set(changed))
+
+    def regroup(field):
+        view_model.set_group(field)
+        sync(tree, view_model)
+
+    def resort(field):
+        view_model.set_sort(field)
+        sync(tree, view_model)
+
+    timed(f"treeview initial load ({count} rows)", sync_update, initial)
+    timed("treeview refresh with 1% changed", sync_update, refreshed)
+    timed("treeview refresh with nothing changed", sync_update, refreshed)
+    timed("treeview search 'headset'", sync, tree, view_model, "headset")
+    timed("treeview clear search", sync, tree, view_model, "")
+    timed("treeview sort by vendor", resort, "vendor")
+    timed("treeview group by vendor", regroup, "vendor")
+    timed("treeview regroup by status", regroup, "status")
+    timed("treeview ungroup", regroup, None)
+    root.destroy()
@@ -0,0 +1,120 @@
+"""
+Round-trip fuzz test for vm-device JSON output.
+Feeds hostile device names through a fake lsusb into the vm-device CLI and checks
+that json.loads and NDJSONStreamDecoder give back exactly the names lsusb printed,
+for --json and --ndjson, with and without --compress.
+
+Usage: python fuzz_device_json.py [SEEDS] [NAMES_PER_SEED]
+"""
+import gzip
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+from ssh_vm_device import NDJSONStreamDecoder
+
+VM_DEVICE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "cli", "vm-device")
+MODES = (["--json"], ["--ndjson"], ["--json", "--compress"], ["--ndjson", "--compress"])
+
+# Name fragments; bytes are written to lsusb verbatim, including invalid UTF-8
+FRAGMENTS = [
+    b'"', b"\\", b"|", b"||", b"\t", b"\r", b"\x01", b"\x1b", b"\x7f", b"{", b"}", b",", b":",
+    b"$", b"`", b"'", b"%s", b"%", b"\\u0000", b"a", b"Z", b" ",
+    "é".encode(), "漢".encode(), "😀".encode(), b"\xff", b"\xc3",
+]
+
+STUBS = {
+    "lsusb": 'cat "$FUZZ_DIR/lsusb.out"\n',
+    "sudo": '"$@"\n',
+    "virsh": (
+        'case "$1" in\n'
+        '  dumpxml) echo "<domain type=\'kvm\' id=\'1\'><devices></devices></domain>" ;;\n'
+        '  domstate) echo running ;;\n'
+        'esac\n'
+    ),
+}
+
+
+def make_names(rng, count):
+    """Build hostile names; trailing whitespace is avoided since lsusb lines are read with it trimmed."""
+    names = []
+    for i in range(count):
+        name = b"".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 20)))
+        if i % 5 == 0:
+            name += b"|"
+        name = name.rstrip(b" \t")
+        names.append(name or b"x")
+    return names
+
+
+def run_vm_device(fuzz_dir, flags):
+    env = dict(os.environ, FUZZ_DIR=fuzz_dir, HOME=fuzz_dir, PATH=fuzz_dir + os.pathsep + os.environ["PATH"])
+    result = subprocess.run(["bash", VM_DEVICE, "--list-available"] + flags, env=env, capture_output=True, timeout=120)
+    if result.returncode != 0:
+        raise RuntimeError(f"vm-device {' '.join(flags)} failed: {result.stderr.decode(errors='replace')}")
+    return result.stdout
+
+
+def decode_streamed(output, chunk_size=7):
+    """Decode output in small chunks so records and UTF-8 sequences are split across feeds."""
+    decoder = NDJSONStreamDecoder()
+    records = []
+    for i in range(0, len(output), chunk_size):
+        records += decoder.feed(output[i:i + chunk_size])
+    return records + decoder.close()
+
+
+def devices_from(records, ndjson):
+    if not ndjson:
+        return records[0]["available_devices"]
+    header, summary = records[0], records[-1]
+    assert header["type"] == "header" and header["schema_version"] == 2, header
+    assert summary["type"] == "summary", summary
+    return [record for record in records if record["type"] == "device"]
+
+
+def check_seed(fuzz_dir, seed, count):
+    rng = random.Random(seed)
+    names = make_names(rng, count)
+    with open(os.path.join(fuzz_dir, "lsusb.out"), "wb") as f:
+        for i, name in enumerate(names):
+            f.write(b"Bus 002 Device %03d: ID 1234:%04x " % (i % 1000, i) + name + b"\n")
+
+    failures = 0
+    for flags in MODES:
+        output = run_vm_device(fuzz_dir, flags)
+        ndjson = "--ndjson" in flags
+        decoded = {"decoder": devices_from(decode_streamed(output), ndjson)}
+        if not ndjson:
+            raw = gzip.decompress(output) if "--compress" in flags else output
+            decoded["json.loads"] = json.loads(raw.decode("utf-8", errors="replace"))["available_devices"]
+        for how, devices in decoded.items():
+            got = {dev["product"]: dev["name"] for dev in devices}
+            for i, name in enumerate(names):
+                expected = name.decode("utf-8", errors="replace")
+                actual = got.get(f"{i:04x}")
+                if actual != expected:
+                    failures += 1
+                    print(f"seed {seed} {' '.join(flags)} ({how}): expected {expected!r}, got {actual!r}")
+    return failures
+
+
+def main():
+    seeds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    with tempfile.TemporaryDirectory() as fuzz_dir:
+        for stub, body in STUBS.items():
+            path = os.path.join(fuzz_dir, stub)
+            with open(path, "w") as f:
+                f.write("#!/bin/bash\n" + body)
+            os.chmod(path, 0o755)
+        failures = sum(check_seed(fuzz_dir, seed, count) for seed in range(seeds))
+    print(f"{seeds} seeds x {count} names x {len(MODES)} modes: {failures} failure(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,92 @@
 import subprocess
 import json
+import socket
+import threading
+import zlib
+
+# vsock CID of the host as seen from a guest, and the vm-device-listener default port
+VMADDR_CID_HOST = getattr(socket, "VMADDR_CID_HOST", 2)
+DEFAULT_VSOCK_PORT = 5730
+
+TRANSPORTS = ("ssh", "vsock", "unix")
+
+# Highest vm-device JSON schema version this client understands
+SUPPORTED_SCHEMA_VERSION = 2
+
+class NDJSONStreamDecoder:
+    """
+    Incrementally decode vm-device output as it arrives.
+    Handles NDJSON records or a single-line JSON document, gzip-compressed or not;
+    invalid UTF-8 is replaced rather than failing the whole listing.
+    """
+    def __init__(self):
+        self._buffer = b""
+        self._head = b""
+        self._decompressor = None
+        self._sniffed = False
+
+    def feed(self, chunk):
+        """Feed raw bytes and return the records completed by them."""
+        if not self._sniffed:
+            self._head += chunk
+            if len(self._head) < 2:
+                return []
+            chunk, self._head = self._head, b""
+            self._start(chunk)
+        if self._decompressor:
+            chunk = self._decompressor.decompress(chunk)
+        self._buffer += chunk
+        *lines, self._buffer = self._buffer.split(b"\n")
+        return [self._decode(line) for line in lines if line.strip()]
+
+    def close(self):
+        """Signal end of stream and return any final record."""
+        if not self._sniffed:
+            chunk, self._head = self._head, b""
+            self._start(chunk)
+            self._buffer += chunk
+        elif self._decompressor:
+            self._buffer += self._decompressor.flush()
+        rest, self._buffer = self._buffer, b""
+        return [self._decode(rest)] if rest.strip() else []
+
+    def _start(self, head):
+        self._sniffed = True
+        if head[:2] == b"\x1f\x8b":
+            self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    @staticmethod
+    def _decode(line):
+        return json.loads(line.decode("utf-8", errors="replace"))
+
 
 class SSHVMDeviceClient:
-    def __init__(self, ssh_host_alias, vm_device_path="~/.local/bin/vm-device", sudo_password=None):
+    def __init__(self, ssh_host_alias, vm_device_path="~/.local/bin/vm-device", sudo_password=None,
+                 transport="ssh", vsock_port=DEFAULT_VSOCK_PORT, vsock_cid=VMADDR_CID_HOST, unix_socket_path=None,
+                 compress=False):
+        """
+        transport selects how requests reach the host:
+          "ssh"   - run vm-device over an SSH session (default)
+          "vsock" - talk to vm-device-listener over AF_VSOCK (no network needed)
+          "unix"  - talk to vm-device-listener over a Unix socket (for testing)
+        compress asks vm-device to gzip streamed listings (useful for large inventories).
+        """
+        if transport not in TRANSPORTS:
+            raise ValueError(f"Unknown transport: {transport}")
         self.ssh_host = ssh_host_alias
         self.vm_device_path = vm_device_path
         self.sudo_password = sudo_password
+        self.transport = transport
+        self.vsock_port = vsock_port
+        self.vsock_cid = vsock_cid
+        self.unix_socket_path = unix_socket_path
+        self.compress = compress
 
     def set_sudo_password(self, password):
         self.sudo_password = password
+        if self.transport != "ssh":
+            # The listener already runs privileged on the host
+            return
         # Run sudo -v to cache credentials on the remote host
         ssh_command = [
             "ssh",
@@ -25,11 +103,7 @@ class SSHVMDeviceClient:
         except Exception:
             pass
 
-    def _run_ssh_command(self, args, use_sudo=True):
-        """
-        Run a command on the remote host via SSH and return parsed JSON output.
-        If use_sudo is True, always use sudo (with or without password).
-        """
+    def _ssh_command(self, args, use_sudo=True):
         if use_sudo:
             if self.sudo_password:
                 remote_cmd = f"echo '{self.sudo_password}' | sudo -S {self.vm_device_path} {' '.join(args)}"
@@ -37,16 +111,27 @@ class SSHVMDeviceClient:
                 remote_cmd = f"sudo {self.vm_device_path} {' '.join(args)}"
         else:
             remote_cmd = f"{self.vm_device_path} {' '.join(args)}"
-        ssh_command = [
+        return [
             "ssh",
             self.ssh_host,
             remote_cmd
         ]
+
+    def _run_ssh_command(self, args, use_sudo=True):
+        """
+        Run a command on the remote host via SSH and return parsed JSON output.
+        If use_sudo is True, always use sudo (with or without password).
+        Socket transports send the same arguments to vm-device-listener instead.
+        """
+        if self.transport != "ssh":
+            return self._run_socket_command(args)
+        ssh_command = self._ssh_command(args, use_sudo)
         try:
             result = subprocess.run(
                 ssh_command,
                 capture_output=True,
-                text=True,
+                encoding="utf-8",
+                errors="replace",
                 timeout=30
             )
             if result.returncode != 0:
@@ -59,12 +144,130 @@ class SSHVMDeviceClient:
         except Exception as e:
             return {"error": str(e), "success": False}
 
-    def list_attached(self):
-        return self._run_ssh_command(["--list", "--json"], use_sudo=True)
+    def _run_socket_command(self, args):
+        """
+        Send one JSON request to vm-device-listener over vsock or a Unix socket
+        and return the parsed JSON response.
+        """
+        if self.transport == "vsock":
+            if not hasattr(socket, "AF_VSOCK"):
+                return {"error": "AF_VSOCK is not supported on this platform", "success": False}
+            family, address = socket.AF_VSOCK, (self.vsock_cid, self.vsock_port)
+        else:
+            if not self.unix_socket_path:
+                return {"error": "No Unix socket path configured", "success": False}
+            family, address = socket.AF_UNIX, self.unix_socket_path
+        try:
+            with socket.socket(family, socket.SOCK_STREAM) as sock:
+                sock.settimeout(30)
+                sock.connect(address)
+                sock.sendall((json.dumps({"args": args}) + "\n").encode("utf-8"))
+                with sock.makefile("r", encoding="utf-8") as response:
+                    output = response.readline()
+            try:
+                return json.loads(output)
+            except json.JSONDecodeError:
+                return {"error": "Failed to parse JSON output", "raw_output": output, "success": False}
+        except Exception as e:
+            return {"error": str(e), "success": False}
+
+    def _stream_ssh_command(self, args, on_record, use_sudo=True, timeout=30):
+        """
+        Run a command on the remote host via SSH and decode its NDJSON output
+        incrementally, calling on_record for each record as it arrives.
+        Returns None on success or an error dict.
+        """
+        try:
+            proc = subprocess.Popen(
+                self._ssh_command(args, use_sudo),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
+        except Exception as e:
+            return {"error": str(e), "success": False}
+        # Drain stderr alongside stdout so a chatty remote cannot fill the pipe and stall
+        stderr = []
+        stderr_reader = threading.Thread(target=lambda: stderr.append(proc.stderr.read()), daemon=True)
+        stderr_reader.start()
+        timed_out = threading.Event()
+
+        def kill():
+            timed_out.set()
+            proc.kill()
+
+        timer = threading.Timer(timeout, kill)
+        timer.start()
+        decoder = NDJSONStreamDecoder()
+        error = None
+        try:
+            while True:
+                chunk = proc.stdout.read1(65536)
+                if not chunk:
+                    break
+                for record in decoder.feed(chunk):
+                    on_record(record)
+            for record in decoder.close():
+                on_record(record)
+        except (ValueError, zlib.error) as e:
+            proc.kill()
+            error = {"error": f"Failed to parse JSON output: {e}", "success": False}
+        finally:
+            timer.cancel()
+            proc.wait()
+            stderr_reader.join()
+            proc.stdout.close()
+            proc.stderr.close()
+        if timed_out.is_set():
+            return {"error": f"Timed out after {timeout} seconds waiting for {self.ssh_host}", "success": False}
+        if error:
+            return error
+        if proc.returncode != 0:
+            return {"error": b"".join(stderr).decode("utf-8", errors="replace").strip(), "success": False}
+        return None
+
+    def _list_devices(self, command, key, on_device=None):
+        """
+        Fetch a device listing, streamed as NDJSON over SSH so on_device can render
+        devices before the listing finishes. Returns the same shape as --json output.
+        """
+        if self.transport != "ssh":
+            return self._run_ssh_command([command, "--json"], use_sudo=True)
+
+        result = {key: [], "success": True}
+
+        def on_record(record):
+            record_type = record.pop("type", None)
+            if record_type == "device":
+                result[key].append(record)
+                if on_device:
+                    on_device(record)
+            elif record_type == "summary":
+                result["summary"] = record
+            elif record_type == "header":
+                result["schema_version"] = record.get("schema_version")
+            elif record_type == "error":
+                result.update(record)
+                result["success"] = False
+            else:
+                result.update(record)
+
+        args = [command, "--ndjson"] + (["--compress"] if self.compress else [])
+        error = self._stream_ssh_command(args, on_record)
+        if error:
+            if "--ndjson" in error.get("error", "") or "--compress" in error.get("error", ""):
+                # Older vm-device without streaming support
+                return self._run_ssh_command([command, "--json"], use_sudo=True)
+            return error
+        if result.get("schema_version", 0) > SUPPORTED_SCHEMA_VERSION:
+            result["warning"] = f"vm-device schema version {result['schema_version']} is newer than this client supports"
+        return result
+
+    def list_attached(self, on_device=None):
+        return self._list_devices("--list", "attached_devices", on_device)
 
-    def list_available(self):
+    def list_available(self, on_device=None):
         # Listing available devices may not require sudo, but can be changed if needed
-        return self._run_ssh_command(["--list-available", "--json"], use_sudo=True)
+        return self._list_devices("--list-available", "available_devices", on_device)
 
     def attach_device(self, vendor, product):
         return self._run_ssh_command(["--attach", f"{vendor}:{product}", "--json"], use_sudo=True)
@@ -9,6 +9,9 @@ try:
 except ImportError:
     PYSTRAY_AVAILABLE = False
 
+# Devices listed per tray submenu; the rest are reachable from the main window
+MAX_TRAY_DEVICES = 25
+
 class TrayManager:
     def __init__(self, gui):
         self.gui = gui
@@ -54,48 +57,48 @@ class TrayManager:
         return img
 
     def _build_menu(self):
-        # Fetch latest device lists from GUI
-        attached = self.gui.get_attached_devices_for_tray()
-        available = self.gui.get_available_devices_for_tray()
-
-        attached_items = []
-        for dev in attached:
-            name = dev["name"]
-            vendor = dev["vendor"]
-            product = dev["product"]
-            attached_items.append(
-                Item(
-                    f"{name} ({vendor}:{product})",
-                    Menu(
-                        Item("Detach", functools.partial(self._tray_detach, vendor, product)),
-                        Item("Reconnect", functools.partial(self._tray_reconnect, vendor, product)),
-                    ),
-                )
-            )
-
-        available_items = []
-        for dev in available:
-            name = dev["name"]
-            vendor = dev["vendor"]
-            product = dev["product"]
-            available_items.append(
-                Item(
-                    f"{name} ({vendor}:{product})",
-                    Menu(
-                        Item("Attach", functools.partial(self._tray_attach, vendor, product)),
-                    ),
-                )
-            )
-
+        # Device submenus are generated lazily by pystray each time the menu is shown
         menu = Menu(
-            Item("Attached Devices", Menu(*attached_items)) if attached_items else Item("Attached Devices", None, enabled=False),
-            Item("Available Devices", Menu(*available_items)) if available_items else Item("Available Devices", None, enabled=False),
+            Item("Attached Devices", Menu(self._attached_items), enabled=lambda item: len(self.gui.attached_model) > 0),
+            Item("Available Devices", Menu(self._available_items), enabled=lambda item: len(self.gui.available_model) > 0),
             Menu.SEPARATOR,
             Item("Show/Hide Main Window", self._toggle_main_window),
             Item("Exit", self._exit_app),
         )
         return menu
 
+    def _attached_items(self):
+        devices, total = self.gui.get_attached_devices_for_tray(MAX_TRAY_DEVICES)
+        items = [
+            Item(
+                f"{dev['name']} ({dev['vendor']}:{dev['product']})",
+                Menu(
+                    Item("Detach", functools.partial(self._tray_detach, dev["vendor"], dev["product"])),
+                    Item("Reconnect", functools.partial(self._tray_reconnect, dev["vendor"], dev["product"])),
+                ),
+            )
+            for dev in devices
+        ]
+        return items + self._overflow_items(total - len(devices))
+
+    def _available_items(self):
+        devices, total = self.gui.get_available_devices_for_tray(MAX_TRAY_DEVICES)
+        items = [
+            Item(
+                f"{dev['name']} ({dev['vendor']}:{dev['product']})",
+                Menu(
+                    Item("Attach", functools.partial(self._tray_attach, dev["vendor"], dev["product"])),
+                ),
+            )
+            for dev in devices
+        ]
+        return items + self._overflow_items(total - len(devices))
+
+    def _overflow_items(self, hidden):
+        if hidden <= 0:
+            return []
+        return [Menu.SEPARATOR, Item(f"{hidden} more... (open main window)", self._toggle_main_window)]
+
     def _tray_detach(self, vendor, product, icon=None, item=None):
         self.gui.tray_detach_device(vendor, product)
 
@@ -118,5 +121,6 @@ class TrayManager:
         self.gui.quit()
 
     def update_menu(self):
+        # The menu reads the device models on demand; just ask the backend to redraw it
         if self.icon:
-            self.icon.menu = self._build_menu()
\ No newline at end of file
+            self.icon.update_menu()
\ No newline at end of file
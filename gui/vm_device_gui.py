@@ -1,11 +1,12 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import threading
-from ssh_vm_device import SSHVMDeviceClient
+from ssh_vm_device import SSHVMDeviceClient, DEFAULT_VSOCK_PORT, TRANSPORTS
 
 import os
 import configparser
 from tray_support import TrayManager
+from device_model import DeviceModel, GROUP_FIELDS
 
 class VMDeviceGUI(tk.Tk):
     CONFIG_PATH = os.path.expanduser("~/.config/vm-device-gui.conf")
@@ -17,9 +18,15 @@ class VMDeviceGUI(tk.Tk):
 
         self.ssh_host_var = tk.StringVar()
         self.vm_device_path_var = tk.StringVar()
+        self.transport_var = tk.StringVar(value="ssh")
+        self.vsock_port_var = tk.StringVar(value=str(DEFAULT_VSOCK_PORT))
+        self.compress_var = tk.BooleanVar(value=False)
+        self.unix_socket_path = None
         self.status_var = tk.StringVar()
         self.client = None
         self.sudo_password = None
+        self.attached_model = DeviceModel()
+        self.available_model = DeviceModel()
 
         self.tray_manager = TrayManager(self)
         self.protocol("WM_DELETE_WINDOW", self._on_close)
@@ -30,14 +37,14 @@ class VMDeviceGUI(tk.Tk):
         self._build_tabs()
         self._build_status_bar()
 
-        # Auto connect on startup if alias is set
-        if self.ssh_host_var.get():
+        # Auto connect on startup if alias is set or a socket transport is configured
+        if self.ssh_host_var.get() or self.transport_var.get() != "ssh":
             self.after(100, self.connect_ssh)
 
     def _open_settings_dialog(self):
         win = tk.Toplevel(self)
         win.title("Settings")
-        win.geometry("350x200")
+        win.geometry("350x350")
         win.grab_set()
         tk.Label(win, text="SSH Host Alias:").pack(pady=10)
         alias_var = tk.StringVar(value=self.ssh_host_var.get())
@@ -47,11 +54,22 @@ class VMDeviceGUI(tk.Tk):
         path_var = tk.StringVar(value=self.vm_device_path_var.get() or "~/.local/bin/vm-device")
         path_entry = tk.Entry(win, textvariable=path_var, width=30)
         path_entry.pack(pady=5)
+        tk.Label(win, text="Transport:").pack(pady=(10, 0))
+        transport_var = tk.StringVar(value=self.transport_var.get())
+        ttk.Combobox(win, textvariable=transport_var, values=TRANSPORTS, state="readonly", width=10).pack(pady=5)
+        tk.Label(win, text="vsock port:").pack()
+        port_var = tk.StringVar(value=self.vsock_port_var.get())
+        tk.Entry(win, textvariable=port_var, width=10).pack(pady=5)
+        compress_var = tk.BooleanVar(value=self.compress_var.get())
+        tk.Checkbutton(win, text="Compress device listings (SSH)", variable=compress_var).pack()
         entry.focus_set()
 
         def save():
             self.ssh_host_var.set(alias_var.get())
             self.vm_device_path_var.set(path_var.get())
+            self.transport_var.set(transport_var.get())
+            self.vsock_port_var.set(port_var.get())
+            self.compress_var.set(compress_var.get())
             self._save_config()
             win.destroy()
 
@@ -67,13 +85,26 @@ class VMDeviceGUI(tk.Tk):
                     self.ssh_host_var.set(config["main"]["ssh_alias"])
                 if "vm_device_path" in config["main"]:
                     self.vm_device_path_var.set(config["main"]["vm_device_path"])
+                if "transport" in config["main"]:
+                    self.transport_var.set(config["main"]["transport"])
+                if "vsock_port" in config["main"]:
+                    self.vsock_port_var.set(config["main"]["vsock_port"])
+                if "unix_socket_path" in config["main"]:
+                    self.unix_socket_path = config["main"]["unix_socket_path"]
+                if "compress" in config["main"]:
+                    self.compress_var.set(config["main"].getboolean("compress", fallback=False))
 
     def _save_config(self):
         config = configparser.ConfigParser()
         config["main"] = {
             "ssh_alias": self.ssh_host_var.get(),
-            "vm_device_path": self.vm_device_path_var.get() or "~/.local/bin/vm-device"
+            "vm_device_path": self.vm_device_path_var.get() or "~/.local/bin/vm-device",
+            "transport": self.transport_var.get() or "ssh",
+            "vsock_port": self.vsock_port_var.get() or str(DEFAULT_VSOCK_PORT),
+            "compress": "yes" if self.compress_var.get() else "no"
         }
+        if self.unix_socket_path:
+            config["main"]["unix_socket_path"] = self.unix_socket_path
         os.makedirs(os.path.dirname(self.CONFIG_PATH), exist_ok=True)
         with open(self.CONFIG_PATH, "w") as f:
             config.write(f)
@@ -112,7 +143,7 @@ class VMDeviceGUI(tk.Tk):
         # Attached Devices Tab
         self.attached_frame = ttk.Frame(self.tabs)
         self.tabs.add(self.attached_frame, text="Attached Devices")
-        self.attached_tree = self._build_device_table(self.attached_frame)
+        self.attached_tree, self.attached_search_var = self._build_device_table(self.attached_frame, self.attached_model)
         btn_frame1 = ttk.Frame(self.attached_frame)
         btn_frame1.pack(fill=tk.X, pady=5)
         self.detach_btn = ttk.Button(btn_frame1, text="Detach", command=self.detach_selected, state=tk.DISABLED)
@@ -123,7 +154,7 @@ class VMDeviceGUI(tk.Tk):
         # Available Devices Tab
         self.available_frame = ttk.Frame(self.tabs)
         self.tabs.add(self.available_frame, text="Available Devices")
-        self.available_tree = self._build_device_table(self.available_frame)
+        self.available_tree, self.available_search_var = self._build_device_table(self.available_frame, self.available_model)
         btn_frame2 = ttk.Frame(self.available_frame)
         btn_frame2.pack(fill=tk.X, pady=5)
         self.attach_btn = ttk.Button(btn_frame2, text="Attach", command=self.attach_selected, state=tk.DISABLED)
@@ -131,14 +162,99 @@ class VMDeviceGUI(tk.Tk):
         ttk.Button(btn_frame2, text="Refresh", command=self.refresh_available).pack(side=tk.RIGHT, padx=5)
         self.available_tree.bind("<<TreeviewSelect>>", self._on_available_select)
 
-    def _build_device_table(self, parent):
+    def _build_device_table(self, parent, model):
+        toolbar = ttk.Frame(parent)
+        toolbar.pack(fill=tk.X, pady=(5, 0))
+        ttk.Label(toolbar, text="Search:").pack(side=tk.LEFT, padx=5)
+        search_var = tk.StringVar()
+        ttk.Entry(toolbar, textvariable=search_var, width=30).pack(side=tk.LEFT)
+        group_var = tk.StringVar(value="none")
+        group_box = ttk.Combobox(toolbar, textvariable=group_var, values=("none",) + GROUP_FIELDS, state="readonly", width=8)
+        group_box.pack(side=tk.RIGHT, padx=5)
+        ttk.Label(toolbar, text="Group by:").pack(side=tk.RIGHT)
+
         columns = ("vendor", "product", "name", "status")
         tree = ttk.Treeview(parent, columns=columns, show="headings", height=12)
         for col in columns:
-            tree.heading(col, text=col.capitalize())
+            tree.heading(col, text=col.capitalize(), command=lambda c=col: self._sort_device_table(tree, model, search_var, c))
             tree.column(col, width=120 if col != "name" else 250)
+        tree.column("#0", width=160)
+        scrollbar = ttk.Scrollbar(parent, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         tree.pack(fill=tk.BOTH, expand=True)
-        return tree
+
+        def regroup(event=None):
+            field = group_var.get()
+            model.set_group(None if field == "none" else field)
+            tree.configure(show="tree headings" if model.group_field else "headings")
+            self._sync_device_table(tree, model, search_var.get())
+
+        group_box.bind("<<ComboboxSelected>>", regroup)
+        search_var.trace_add("write", lambda *args: self._sync_device_table(tree, model, search_var.get()))
+        return tree, search_var
+
+    def _sort_device_table(self, tree, model, search_var, field):
+        reverse = model.sort_field == field and not model.sort_reverse
+        model.set_sort(field, reverse)
+        self._sync_device_table(tree, model, search_var.get())
+
+    @staticmethod
+    def _sync_device_table(tree, model, query="", changed=()):
+        """
+        Bring a Treeview in line with its model, touching only rows that differ:
+        stale rows are deleted, new rows inserted in place, changed rows updated,
+        and existing rows are only moved when their order or group changed.
+        """
+        layout = []
+        for group, keys in model.grouped_view(query):
+            parent = "" if group is None else f"group:{group}"
+            if parent:
+                if not tree.exists(parent):
+                    tree.insert("", "end", iid=parent, open=True)
+                tree.item(parent, text=f"{group} ({len(keys)})")
+            layout.append((parent, keys))
+
+        # Drop stale rows and unlink rows whose group changed before removing stale groups
+        desired = {key: parent for parent, keys in layout for key in keys}
+        groups = [iid for iid in tree.get_children("") if iid.startswith("group:")]
+        placed = {}
+        for parent in [""] + groups:
+            for iid in tree.get_children(parent):
+                if not iid.startswith("group:"):
+                    placed[iid] = parent
+        for iid, parent in placed.items():
+            if iid not in desired:
+                tree.delete(iid)
+            elif desired[iid] != parent:
+                tree.detach(iid)
+        wanted_groups = [parent for parent, keys in layout if parent]
+        for iid in groups:
+            if iid not in wanted_groups:
+                tree.delete(iid)
+        for index, parent in enumerate(wanted_groups):
+            if tree.index(parent) != index:
+                tree.move(parent, "", index)
+
+        for parent, keys in layout:
+            current = [iid for iid in tree.get_children(parent) if not iid.startswith("group:")]
+            present = set(current)
+            survivors = [key for key in keys if key in present]
+            if current != survivors:
+                for index, key in enumerate(survivors):
+                    tree.move(key, parent, index)
+            for index, key in enumerate(keys):
+                if key in present and key not in changed:
+                    continue
+                dev = model.get(key)
+                values = (dev["vendor"], dev["product"], dev["name"], dev["status"])
+                if key in present:
+                    tree.item(key, values=values)
+                elif tree.exists(key):
+                    tree.move(key, parent, index)
+                    tree.item(key, values=values)
+                else:
+                    tree.insert(parent, index, iid=key, values=values)
 
     def _build_status_bar(self):
         status_frame = ttk.Frame(self)
@@ -147,12 +263,36 @@ class VMDeviceGUI(tk.Tk):
 
     def connect_ssh(self):
         host = self.ssh_host_var.get().strip()
-        if not host:
+        transport = self.transport_var.get() or "ssh"
+        if transport not in TRANSPORTS:
+            messagebox.showerror("Error", f"Unknown transport '{transport}'. Choose one of: {', '.join(TRANSPORTS)}.")
+            return
+        if transport == "ssh" and not host:
             messagebox.showerror("Error", "Please enter an SSH host alias.")
             return
+        if transport == "unix" and not self.unix_socket_path:
+            messagebox.showerror("Error", "The unix transport needs unix_socket_path set in the config file.")
+            return
+        try:
+            vsock_port = int(self.vsock_port_var.get() or DEFAULT_VSOCK_PORT)
+        except ValueError:
+            messagebox.showerror("Error", "The vsock port must be a number.")
+            return
         vm_device_path = self.vm_device_path_var.get() or "~/.local/bin/vm-device"
-        self.client = SSHVMDeviceClient(host, vm_device_path=vm_device_path)
-        self.status_var.set(f"Connected to {host}")
+        self.client = SSHVMDeviceClient(
+            host,
+            vm_device_path=vm_device_path,
+            transport=transport,
+            vsock_port=vsock_port,
+            unix_socket_path=self.unix_socket_path,
+            compress=self.compress_var.get()
+        )
+        if transport == "vsock":
+            self.status_var.set(f"Connected to host via vsock port {vsock_port}")
+        elif transport == "unix":
+            self.status_var.set(f"Connected to {self.unix_socket_path}")
+        else:
+            self.status_var.set(f"Connected to {host}")
         # Sequential initial loading to avoid double sudo prompt
         threading.Thread(target=self._sequential_initial_load, daemon=True).start()
 
@@ -173,7 +313,8 @@ class VMDeviceGUI(tk.Tk):
         threading.Thread(target=self._load_available, daemon=True).start()
 
     def _load_attached(self, retry=False):
-        result = self.client.list_attached()
+        on_device = self._progressive_loader(self.attached_tree, self.attached_model, self.attached_search_var)
+        result = self.client.list_attached(on_device=on_device)
         sudo_error = self._is_sudo_error(result)
         if sudo_error and not retry:
             pw = self.prompt_sudo_password()
@@ -182,10 +323,11 @@ class VMDeviceGUI(tk.Tk):
                 self.sudo_password = pw
                 self._load_attached(retry=True)
                 return
-        self._update_device_table(self.attached_tree, result, "attached_devices")
+        self._update_device_table(self.attached_tree, self.attached_model, self.attached_search_var, result, "attached_devices")
 
     def _load_available(self, retry=False):
-        result = self.client.list_available()
+        on_device = self._progressive_loader(self.available_tree, self.available_model, self.available_search_var)
+        result = self.client.list_available(on_device=on_device)
         sudo_error = self._is_sudo_error(result)
         if sudo_error and not retry:
             pw = self.prompt_sudo_password()
@@ -194,16 +336,40 @@ class VMDeviceGUI(tk.Tk):
                 self.sudo_password = pw
                 self._load_available(retry=True)
                 return
-        self._update_device_table(self.available_tree, result, "available_devices")
-
-    def _update_device_table(self, tree, result, key):
+        self._update_device_table(self.available_tree, self.available_model, self.available_search_var, result, "available_devices")
+
+    def _progressive_loader(self, tree, model, search_var, batch=100):
+        """
+        On first load, return a per-device callback that shows streamed devices in
+        batches so large listings appear before they finish. Refreshes return None
+        and are applied in one diff when complete.
+        """
+        if len(model):
+            return None
+        received = []
+
+        def show(devices):
+            if not len(model) or len(devices) > len(model):
+                model.update(devices)
+                self._sync_device_table(tree, model, search_var.get())
+                self.status_var.set(f"Loading devices... {len(devices)} so far")
+
+        def on_device(device):
+            received.append(device)
+            if len(received) % batch == 0:
+                snapshot = list(received)
+                self.after(0, lambda: show(snapshot))
+        return on_device
+
+    def _update_device_table(self, tree, model, search_var, result, key):
         def update():
-            tree.delete(*tree.get_children())
             if result.get("success", True) and key in result:
-                for dev in result[key]:
-                    tree.insert("", "end", values=(dev["vendor"], dev["product"], dev["name"], dev["status"]))
-                self.status_var.set("Loaded devices.")
+                added, removed, changed = model.update(result[key])
+                self._sync_device_table(tree, model, search_var.get(), set(changed))
+                self.status_var.set(f"Loaded {len(model)} devices.")
             else:
+                model.update([])
+                self._sync_device_table(tree, model, search_var.get())
                 self.status_var.set(result.get("error", "Failed to load devices."))
         self.after(0, update)
         # Always update tray menu after device table update
@@ -220,19 +386,19 @@ class VMDeviceGUI(tk.Tk):
 
     def detach_selected(self):
         selected = self.attached_tree.selection()
-        if not selected:
+        dev = self.attached_model.get(selected[0]) if selected else None
+        if not dev:
             return
-        values = self.attached_tree.item(selected[0], "values")
-        vendor, product = values[0], values[1]
+        vendor, product = dev["vendor"], dev["product"]
         self.status_var.set(f"Detaching {vendor}:{product}...")
         threading.Thread(target=self._detach_device, args=(vendor, product), daemon=True).start()
 
     def attach_selected(self):
         selected = self.available_tree.selection()
-        if not selected:
+        dev = self.available_model.get(selected[0]) if selected else None
+        if not dev:
             return
-        values = self.available_tree.item(selected[0], "values")
-        vendor, product = values[0], values[1]
+        vendor, product = dev["vendor"], dev["product"]
         self.status_var.set(f"Attaching {vendor}:{product}...")
         threading.Thread(target=self._attach_device, args=(vendor, product), daemon=True).start()
 
@@ -324,22 +490,12 @@ class VMDeviceGUI(tk.Tk):
             self.after(1000, self.tray_manager.update_menu)
             self.tray_manager.start()
 
-    def get_attached_devices_for_tray(self):
-        # Return a list of dicts: {name, vendor, product}
-        items = []
-        for row in self.attached_tree.get_children():
-            values = self.attached_tree.item(row, "values")
-            if values:
-                items.append({"vendor": values[0], "product": values[1], "name": values[2]})
-        return items
-
-    def get_available_devices_for_tray(self):
-        items = []
-        for row in self.available_tree.get_children():
-            values = self.available_tree.item(row, "values")
-            if values:
-                items.append({"vendor": values[0], "product": values[1], "name": values[2]})
-        return items
+    def get_attached_devices_for_tray(self, limit=None):
+        # Return (devices, total): device dicts {name, vendor, product, status}, capped to limit
+        return self.attached_model.devices(limit), len(self.attached_model)
+
+    def get_available_devices_for_tray(self, limit=None):
+        return self.available_model.devices(limit), len(self.available_model)
 
     def tray_detach_device(self, vendor, product):
         threading.Thread(target=self._detach_device, args=(vendor, product), daemon=True).start()